@@ -6,11 +6,12 @@ from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from typing import Dict
+import os
 
 APP = FastAPI(title="GE5219 Real-Time Dengue Map")
 
 static_root = Path(__file__).parent / "visualization" / "static"
-APP.mount("/static", StaticFiles(directory=static_root), name="static")
+APP.mount("/static", StaticFiles(directory=static_root, check_dir=False, html=True), name="static")
 
 @APP.get("/health")
 async def healthcheck() -> Dict[str, str]:
@@ -23,4 +24,7 @@ async def index() -> Dict[str, str]:
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(APP, host="0.0.0.0", port=8000, reload=True)
+    # The reload watcher keeps re-scanning the project tree; enable it only for
+    # local development (DENGUE_DEBUG=1). Reload needs an import string.
+    debug = os.getenv("DENGUE_DEBUG") == "1"
+    uvicorn.run("main:APP" if debug else APP, host="0.0.0.0", port=8000, reload=debug)
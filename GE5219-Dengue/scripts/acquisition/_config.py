@@ -0,0 +1,16 @@
+"""Shared API configuration for the acquisition scripts, parsed once on first use."""
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict
+
+import orjson
+
+CONFIG_PATH = Path(__file__).resolve().parents[2] / "config" / "api_config.json"
+
+
+@lru_cache(maxsize=None)
+def get_api_config() -> Dict[str, Any]:
+    """Load API configuration from JSON file (parsed once per process)."""
+    return orjson.loads(CONFIG_PATH.read_bytes())
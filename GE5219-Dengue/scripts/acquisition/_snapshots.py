@@ -0,0 +1,87 @@
+"""Helpers shared by the acquisition scripts for writing, locating and revalidating saved snapshots."""
+from __future__ import annotations
+
+import mmap
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import httpx
+import orjson
+
+T = TypeVar("T")
+
+_ENVELOPE_PREFIX = b'{"data":'
+
+
+def latest_snapshot(directory: Path, name_prefix: str, max_age: Optional[float] = None) -> Optional[Path]:
+    """Return the newest `name_prefix*.json` file in `directory`.
+
+    Args:
+        directory: Folder holding the snapshots; a missing folder yields None.
+        name_prefix: File name prefix identifying the dataset and date.
+        max_age: If given, only return the snapshot when it is younger than this many seconds.
+    """
+    newest: Optional[str] = None
+    newest_mtime = 0.0
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith(name_prefix) and entry.name.endswith(".json"):
+                    mtime = entry.stat().st_mtime
+                    if mtime > newest_mtime:
+                        newest, newest_mtime = entry.path, mtime
+    except FileNotFoundError:
+        return None
+    if newest is None or (max_age is not None and time.time() - newest_mtime >= max_age):
+        return None
+    return Path(newest)
+
+
+def conditional_headers(snapshot: Optional[Path]) -> Dict[str, str]:
+    """Build If-None-Match from the ETag sidecar saved next to `snapshot`."""
+    if snapshot is None:
+        return {}
+    try:
+        etag = snapshot.with_suffix(".etag").read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return {}
+    return {"If-None-Match": etag} if etag else {}
+
+
+def save_etag(output_file: Path, response: httpx.Response) -> None:
+    """Persist the response ETag beside `output_file` for the next conditional GET."""
+    etag = response.headers.get("etag")
+    if etag:
+        output_file.with_suffix(".etag").write_text(etag, encoding="utf-8")
+
+
+def stream_envelope(
+    response: httpx.Response, output_file: Path, metadata: Dict[str, Any], inspect: Callable[[memoryview], T]
+) -> T:
+    """Copy `response` into `output_file` as {"data": ..., "metadata": ...} and return `inspect(body)`.
+
+    The body is written chunk by chunk and never re-serialised. `inspect` is
+    called on a memory-mapped view of the written body before `metadata` is
+    appended, so it may add fields such as record counts. A partial file is
+    removed on error.
+    """
+    try:
+        with output_file.open("w+b") as fh:
+            fh.write(_ENVELOPE_PREFIX)
+            for chunk in response.iter_bytes(65536):
+                fh.write(chunk)
+            fh.flush()
+
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                with view[len(_ENVELOPE_PREFIX):] as body:
+                    result = inspect(body)
+
+            fh.write(b',"metadata":')
+            fh.write(orjson.dumps(metadata))
+            fh.write(b"}")
+        return result
+    except BaseException:
+        output_file.unlink(missing_ok=True)
+        raise
@@ -3,14 +3,63 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import httpx
-import json
-from typing import Optional
+import orjson
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 RAW_DIR = Path(__file__).resolve().parents[2] / "data" / "raw" / "dengue"
 
+# Shared client: the poll-download and CDN requests (and repeated calls)
+# reuse pooled keep-alive connections instead of a fresh TLS handshake each.
+_CLIENT = httpx.Client(
+    timeout=30.0,
+    http2=True,
+    headers={"Accept-Encoding": "gzip, br"},
+    limits=httpx.Limits(max_keepalive_connections=4),
+)
+atexit.register(_CLIENT.close)
+
+# poll-download hands out a signed URL for a constant dataset, so resolve it
+# once and reuse it for a short TTL instead of polling on every fetch.
+_DATA_URL_TTL_SECONDS = 300
+_DATA_URL_CACHE: Dict[str, Tuple[str, float]] = {}
+_DATA_URL_LOCK = threading.Lock()
+
+def _resolve_data_url(poll_url: str) -> Tuple[str, bool]:
+    """Return the download URL published by `poll_url` (cached for a few minutes) and whether it was cached."""
+    with _DATA_URL_LOCK:
+        cached = _DATA_URL_CACHE.get(poll_url)
+        if cached and time.monotonic() - cached[1] < _DATA_URL_TTL_SECONDS:
+            return cached[0], True
+        
+        response = _CLIENT.get(poll_url)
+        response.raise_for_status()
+        
+        api_response = orjson.loads(response.content)
+        if api_response.get('code') != 0:
+            error_msg = api_response.get('errMsg', 'Unknown API error')
+            logger.error(f"Error code: {api_response.get('code')}, API Error: {error_msg}")
+            raise RuntimeError(f"API Error: {error_msg}")
+        
+        data_url = api_response['data']['url']
+        _DATA_URL_CACHE[poll_url] = (data_url, time.monotonic())
+        return data_url, False
+
+def _evict_data_url(poll_url: str, data_url: str) -> None:
+    """Drop `data_url` from the cache unless another thread has already replaced it."""
+    with _DATA_URL_LOCK:
+        cached = _DATA_URL_CACHE.get(poll_url)
+        if cached and cached[0] == data_url:
+            del _DATA_URL_CACHE[poll_url]
+
 def fetch_clusters(target_date: Optional[str] = None) -> None:
     """
     Fetch dengue cluster data from Singapore Open Data API.
@@ -22,7 +71,7 @@ def fetch_clusters(target_date: Optional[str] = None) -> None:
     """
     try:
         RAW_DIR.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        timestamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
         
         # Add date suffix to filename if specific date requested
         date_suffix = f"_{target_date}" if target_date else "_latest"
@@ -32,64 +81,65 @@ def fetch_clusters(target_date: Optional[str] = None) -> None:
         dataset_id = "d_dbfabf16158d1b0e1c420627c0819168"
         url = f"https://api-open.data.gov.sg/v1/public/api/datasets/{dataset_id}/poll-download"
         
-        print(f"Fetching dengue cluster data for date: {target_date or 'latest'}")
+        logger.info(f"Fetching dengue cluster data for date: {target_date or 'latest'}")
+        
+        # First, get the download URL (reused across calls for a few minutes)
+        data_url, from_cache = _resolve_data_url(url)
+        logger.info(f"Data URL obtained: {data_url}")
+        
+        # Fetch the actual dengue data
+        data_response = _CLIENT.get(data_url)
+        if data_response.is_error:
+            # Never keep serving a failing signed URL for the rest of the TTL; a
+            # cached one may just have expired, so re-poll once for a fresh URL.
+            _evict_data_url(url, data_url)
+            if from_cache:
+                data_url, _ = _resolve_data_url(url)
+                logger.info(f"Cached data URL failed; new data URL obtained: {data_url}")
+                data_response = _CLIENT.get(data_url)
+                if data_response.is_error:
+                    _evict_data_url(url, data_url)
+        data_response.raise_for_status()
+        
+        # Keep the payload bytes as delivered; parse only to count records
+        raw_payload = data_response.content
+        dengue_data = orjson.loads(raw_payload)
         
-        with httpx.Client(timeout=30.0) as client:
-            # First, get the download URL
-            response = client.get(url)
-            response.raise_for_status()
-            
-            api_response = response.json()
-            if api_response.get('code') != 0:
-                error_msg = api_response.get('errMsg', 'Unknown API error')
-                print(f"Error code: {api_response.get('code')}, API Error: {error_msg}")
-                raise RuntimeError(f"API Error: {error_msg}")
-            
-            # Get the actual data URL
-            data_url = api_response['data']['url']
-            print(f"Data URL obtained: {data_url}")
-            
-            # Fetch the actual dengue data
-            data_response = client.get(data_url)
-            data_response.raise_for_status()
-            
-            # Parse and save the data
-            dengue_data = data_response.json()
-            
-            # Add metadata for processing pipeline
-            metadata = {
-                "fetch_timestamp": timestamp,
-                "target_date": target_date,
-                "api_endpoint": url,
-                "data_url": data_url,
-                "record_count": len(dengue_data.get('features', [])) if isinstance(dengue_data, dict) else len(dengue_data) if isinstance(dengue_data, list) else 0
-            }
-            
-            # Combine data with metadata
-            output_data = {
-                "metadata": metadata,
-                "data": dengue_data
-            }
+        # Add metadata for processing pipeline
+        metadata = {
+            "fetch_timestamp": timestamp,
+            "target_date": target_date,
+            "api_endpoint": url,
+            "data_url": data_url,
+            "record_count": len(dengue_data.get('features', [])) if isinstance(dengue_data, dict) else len(dengue_data) if isinstance(dengue_data, list) else 0
+        }
         
-        output_file.write_text(json.dumps(output_data, indent=2), encoding="utf-8")
-        print(f"Dengue cluster data saved to: {output_file}")
-        print(f"Records fetched: {metadata['record_count']}")
+        # Splice the raw payload into the {"metadata", "data"} envelope rather
+        # than re-serialising the parsed object graph.
+        with output_file.open("wb") as fh:
+            fh.write(b'{"metadata":')
+            fh.write(orjson.dumps(metadata))
+            fh.write(b',"data":')
+            fh.write(raw_payload)
+            fh.write(b"}")
+        logger.info(f"Dengue cluster data saved to: {output_file}")
+        logger.info(f"Records fetched: {metadata['record_count']}")
         
     except httpx.HTTPStatusError as e:
-        print(f"Error code: {e.response.status_code}, HTTP Error: {e.response.text}")
-        print(f"Failed to fetch dengue data - HTTP {e.response.status_code}")
+        logger.error(f"Error code: {e.response.status_code}, HTTP Error: {e.response.text}")
+        logger.error(f"Failed to fetch dengue data - HTTP {e.response.status_code}")
         raise
     except httpx.TimeoutException:
-        print("Error code: TIMEOUT, Connection timeout - API server not responding")
-        print("Failed to fetch dengue data - Connection timeout")
+        logger.error("Error code: TIMEOUT, Connection timeout - API server not responding")
+        logger.error("Failed to fetch dengue data - Connection timeout")
         raise
-    except json.JSONDecodeError as e:
-        print(f"Error code: JSON_DECODE, Invalid JSON response: {str(e)}")
-        print("Failed to parse dengue data - Invalid JSON response")
+    except orjson.JSONDecodeError as e:
+        logger.error(f"Error code: JSON_DECODE, Invalid JSON response: {str(e)}")
+        logger.error("Failed to parse dengue data - Invalid JSON response")
         raise
     except Exception as e:
-        print(f"Error code: UNKNOWN, Unexpected error: {str(e)}")
-        print(f"Unexpected error in dengue data acquisition: {type(e).__name__}")
+        logger.error(f"Error code: UNKNOWN, Unexpected error: {str(e)}")
+        logger.error(f"Unexpected error in dengue data acquisition: {type(e).__name__}")
         raise
 
 def fetch_historical_dengue(months_back: int = 2) -> None:
@@ -99,24 +149,29 @@ def fetch_historical_dengue(months_back: int = 2) -> None:
     Args:
         months_back: Number of months to go back (default: 2 for temporal lag)
     """
-    target_date = (datetime.now() - timedelta(days=months_back * 30)).strftime("%Y-%m-%d")
-    print(f"Fetching historical dengue data from {months_back} months ago: {target_date}")
+    # Plain epoch arithmetic; local time keeps the date identical to datetime.now()
+    target_date = time.strftime("%Y-%m-%d", time.localtime(time.time() - months_back * 30 * 86400))
+    logger.info(f"Fetching historical dengue data from {months_back} months ago: {target_date}")
     fetch_clusters(target_date)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
     # Example usage:
     # fetch_clusters()  # Latest data
     # fetch_clusters("2024-08-09")  # Specific date
     # fetch_historical_dengue(2)  # 2 months ago for temporal lag
     
-    print("=== Dengue Data Acquisition ===")
-    print("Fetching latest dengue cluster data...")
-    fetch_clusters()
+    logger.info("=== Dengue Data Acquisition ===")
+    logger.info("Fetching latest and historical (temporal lag) dengue cluster data...")
     
-    print("\nFetching historical data for temporal lag analysis...")
-    fetch_historical_dengue(2)
+    # The two fetches are independent and network-bound, so run them
+    # concurrently over the shared client instead of back to back.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(fetch_clusters), pool.submit(fetch_historical_dengue, 2)]
+        for future in futures:
+            future.result()
     
-    print("\nDengue data acquisition completed!")
+    logger.info("Dengue data acquisition completed!")
 
 
 """
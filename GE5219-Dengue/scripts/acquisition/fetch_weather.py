@@ -2,152 +2,172 @@
 # CWQ
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import atexit
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+import re
 import httpx
-import json
-from typing import Optional
+import orjson
+from typing import Any, Dict, Optional
+
+try:
+    from ._snapshots import latest_snapshot, stream_envelope
+except ImportError:  # run as a script from scripts/acquisition
+    from _snapshots import latest_snapshot, stream_envelope
+
+logger = logging.getLogger(__name__)
 
 RAW_WEATHER = Path(__file__).resolve().parents[2] / "data" / "raw" / "weather"
+_TIMESTAMP_FORMAT = "%Y%m%dT%H%M%SZ"
+_DAY = timedelta(days=1)
+
+# Shared, pooled client: temperature, rainfall and historical requests reuse
+# keep-alive connections instead of paying a TLS handshake each.
+_CLIENT = httpx.Client(
+    timeout=30.0,
+    http2=True,
+    headers={"Accept-Encoding": "gzip, br"},
+    limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+)
+atexit.register(_CLIENT.close)
 
-def fetch_air_temperature(target_date: Optional[str] = None) -> None:
+_STATIONS_MARKER = re.compile(rb'"stations"\s*:\s*\[')
+_STATION_ID_KEY = re.compile(rb'"id"\s*:')
+
+def _count_stations(body: Any) -> int:
     """
-    Fetch air temperature data from Singapore Open Data API.
+    Count station records in a raw API payload without building the JSON tree.
     
-    Args:
-        target_date: Optional date string in YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS format.
-                    If None, fetches latest data.
-                    For temporal lag analysis, use date from 2 months ago.
+    Only station objects carry a bare "id" key (readings use "stationId"), so a
+    C-level regex scan over the bytes is enough. Payloads without a stations
+    array fall back to a full parse.
     """
-    try:
-        temp_dir = RAW_WEATHER / "temperature"
-        temp_dir.mkdir(parents=True, exist_ok=True)
-        
-        timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-        date_suffix = f"_{target_date}" if target_date else "_latest"
-        output_file = temp_dir / f"air_temperature{date_suffix}_{timestamp}.json"
-        
-        url = "https://api-open.data.gov.sg/v2/real-time/api/air-temperature"
-        
-        # Add date parameter if specified
-        params = {}
-        if target_date:
-            params['date'] = target_date
-            print(f"Fetching air temperature data for date: {target_date}")
-        else:
-            print("Fetching latest air temperature data...")
-        
-        with httpx.Client(timeout=30.0) as client:
-            response = client.get(url, params=params)
-            response.raise_for_status()
-            temp_data = response.json()
-            
-            # Add metadata for processing pipeline
-            metadata = {
-                "fetch_timestamp": timestamp,
-                "target_date": target_date,
-                "api_endpoint": url,
-                "station_count": len(temp_data.get('data', {}).get('stations', [])) if isinstance(temp_data, dict) else 0
-            }
-            
-            # Combine data with metadata
-            output_data = {
-                "metadata": metadata,
-                "data": temp_data
-            }
-        
-        output_file.write_text(json.dumps(output_data, indent=2), encoding="utf-8")
-        print(f"Air temperature data saved to: {output_file}")
-        print(f"Weather stations: {metadata['station_count']}")
+    if _STATIONS_MARKER.search(body) is None:
+        payload = orjson.loads(body)
+        return len(payload.get('data', {}).get('stations', [])) if isinstance(payload, dict) else 0
+    return sum(1 for _ in _STATION_ID_KEY.finditer(body))
 
-    except httpx.HTTPStatusError as e:
-        print(f"Error code: {e.response.status_code}, HTTP Error: {e.response.text}")
-        print(f"Failed to fetch temperature data - HTTP {e.response.status_code}")
-        if e.response.status_code == 404:
-            print("Tip: Weather data might not be available for the requested date")
-        raise
-    except httpx.TimeoutException:
-        print("Error code: TIMEOUT, Connection timeout - API server not responding")
-        print("Failed to fetch temperature data - Connection timeout")
-        raise
-    except json.JSONDecodeError as e:
-        print(f"Error code: JSON_DECODE, Invalid JSON response: {str(e)}")
-        print("Failed to parse temperature data - Invalid JSON response")
-        raise
-    except Exception as e:
-        print(f"Error code: UNKNOWN, Unexpected error: {str(e)}")
-        print(f"Unexpected error in temperature data acquisition: {type(e).__name__}")
-        raise
+def _stream_payload(url: str, params: Dict[str, str], output_file: Path, metadata: Dict[str, Any]) -> None:
+    """
+    Stream an API response into `output_file` via `stream_envelope`.
+    
+    The station count is scanned from the written bytes and stored in
+    `metadata` before it is appended.
+    """
+    def record_station_count(body: memoryview) -> None:
+        metadata["station_count"] = _count_stations(body)
+    
+    with _CLIENT.stream("GET", url, params=params) as response:
+        if response.is_error:
+            response.read()  # keep the body available to error handlers
+        response.raise_for_status()
+        stream_envelope(response, output_file, metadata, record_station_count)
 
-def fetch_rainfall(target_date: Optional[str] = None) -> None:
+# Per-dataset settings; everything else about a weather fetch is shared.
+_WEATHER_DATASETS: Dict[str, Dict[str, Any]] = {
+    "air_temperature": {
+        "url": "https://api-open.data.gov.sg/v2/real-time/api/air-temperature",
+        "subdir": "temperature",
+        "prefix": "air_temperature",
+        "label": "air temperature",
+        "kind": "temperature",
+        "tip_label": "Weather",
+        "ttl_seconds": 60,  # upstream refreshes every minute
+    },
+    "rainfall": {
+        "url": "https://api-open.data.gov.sg/v2/real-time/api/rainfall",
+        "subdir": "rainfall",
+        "prefix": "rainfall",
+        "label": "rainfall",
+        "kind": "rainfall",
+        "tip_label": "Rainfall",
+        "ttl_seconds": 300,  # upstream refreshes every 5 minutes
+    },
+}
+
+# The output folders are fixed, so create them once at import rather than per fetch.
+for _dataset in _WEATHER_DATASETS.values():
+    (RAW_WEATHER / _dataset["subdir"]).mkdir(parents=True, exist_ok=True)
+
+def _fetch_weather_dataset(config: Dict[str, Any], target_date: Optional[str] = None) -> Path:
     """
-    Fetch rainfall data from Singapore Open Data API.
+    Fetch one weather dataset described by an entry of `_WEATHER_DATASETS`.
     
     Args:
+        config: Dataset settings (endpoint, output folder/prefix, log labels).
         target_date: Optional date string in YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS format.
                     If None, fetches latest data.
-                    For temporal lag analysis, use date from 2 months ago.
+    
+    Returns:
+        Path to the saved file. A file fetched within the dataset's upstream
+        refresh interval (``ttl_seconds``) is reused instead of re-downloading.
     """
+    label, kind = config["label"], config["kind"]
     try:
-        rainfall_dir = RAW_WEATHER / "rainfall"
-        rainfall_dir.mkdir(parents=True, exist_ok=True)
+        directory = RAW_WEATHER / config["subdir"]
         
-        timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
         date_suffix = f"_{target_date}" if target_date else "_latest"
-        output_file = rainfall_dir / f"rainfall{date_suffix}_{timestamp}.json"
+        name_prefix = f"{config['prefix']}{date_suffix}_"
+        
+        # Upstream has not refreshed since the last save; skip network and disk.
+        cached_file = latest_snapshot(directory, name_prefix, max_age=config["ttl_seconds"])
+        if cached_file is not None:
+            logger.info(f"Reusing {label} data fetched within the last {config['ttl_seconds']}s: {cached_file}")
+            return cached_file
+        
+        timestamp = datetime.now(timezone.utc).strftime(_TIMESTAMP_FORMAT)
+        output_file = directory / f"{name_prefix}{timestamp}.json"
         
-        url = "https://api-open.data.gov.sg/v2/real-time/api/rainfall"
+        url = config["url"]
         
         # Add date parameter if specified
         params = {}
         if target_date:
             params['date'] = target_date
-            print(f"Fetching rainfall data for date: {target_date}")
+            logger.info(f"Fetching {label} data for date: {target_date}")
         else:
-            print("Fetching latest rainfall data...")
+            logger.info(f"Fetching latest {label} data...")
         
-        with httpx.Client(timeout=30.0) as client:
-            response = client.get(url, params=params)
-            response.raise_for_status()
-            rainfall_data = response.json()
-            
-            # Add metadata for processing pipeline
-            metadata = {
-                "fetch_timestamp": timestamp,
-                "target_date": target_date,
-                "api_endpoint": url,
-                "station_count": len(rainfall_data.get('data', {}).get('stations', [])) if isinstance(rainfall_data, dict) else 0
-            }
-            
-            # Combine data with metadata
-            output_data = {
-                "metadata": metadata,
-                "data": rainfall_data
-            }
-        
-        output_file.write_text(json.dumps(output_data, indent=2), encoding="utf-8")
-        print(f"Rainfall data saved to: {output_file}")
-        print(f"Weather stations: {metadata['station_count']}")
+        # Add metadata for processing pipeline (station_count filled in on save)
+        metadata: Dict[str, Any] = {
+            "fetch_timestamp": timestamp,
+            "target_date": target_date,
+            "api_endpoint": url,
+        }
+        _stream_payload(url, params, output_file, metadata)
+        logger.info(f"{label.capitalize()} data saved to: {output_file}")
+        logger.info(f"Weather stations: {metadata['station_count']}")
+        return output_file
 
     except httpx.HTTPStatusError as e:
-        print(f"Error code: {e.response.status_code}, HTTP Error: {e.response.text}")
-        print(f"Failed to fetch rainfall data - HTTP {e.response.status_code}")
+        logger.error(f"Error code: {e.response.status_code}, HTTP Error: {e.response.text}")
+        logger.error(f"Failed to fetch {kind} data - HTTP {e.response.status_code}")
         if e.response.status_code == 404:
-            print("Tip: Rainfall data might not be available for the requested date")
+            logger.warning(f"Tip: {config['tip_label']} data might not be available for the requested date")
         raise
     except httpx.TimeoutException:
-        print("Error code: TIMEOUT, Connection timeout - API server not responding")
-        print("Failed to fetch rainfall data - Connection timeout")
+        logger.error("Error code: TIMEOUT, Connection timeout - API server not responding")
+        logger.error(f"Failed to fetch {kind} data - Connection timeout")
         raise
-    except json.JSONDecodeError as e:
-        print(f"Error code: JSON_DECODE, Invalid JSON response: {str(e)}")
-        print("Failed to parse rainfall data - Invalid JSON response")
+    except orjson.JSONDecodeError as e:
+        logger.error(f"Error code: JSON_DECODE, Invalid JSON response: {str(e)}")
+        logger.error(f"Failed to parse {kind} data - Invalid JSON response")
         raise
     except Exception as e:
-        print(f"Error code: UNKNOWN, Unexpected error: {str(e)}")
-        print(f"Unexpected error in rainfall data acquisition: {type(e).__name__}")
+        logger.error(f"Error code: UNKNOWN, Unexpected error: {str(e)}")
+        logger.error(f"Unexpected error in {kind} data acquisition: {type(e).__name__}")
         raise
 
+def fetch_air_temperature(target_date: Optional[str] = None) -> Path:
+    """Fetch air temperature data from Singapore Open Data API (see `_fetch_weather_dataset`)."""
+    return _fetch_weather_dataset(_WEATHER_DATASETS["air_temperature"], target_date)
+
+def fetch_rainfall(target_date: Optional[str] = None) -> Path:
+    """Fetch rainfall data from Singapore Open Data API (see `_fetch_weather_dataset`)."""
+    return _fetch_weather_dataset(_WEATHER_DATASETS["rainfall"], target_date)
+
 def fetch_weather(target_date: Optional[str] = None) -> None:
     """
     Fetch both air temperature and rainfall data.
@@ -157,23 +177,32 @@ def fetch_weather(target_date: Optional[str] = None) -> None:
                     Format: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS
     """
     try:
-        RAW_WEATHER.mkdir(parents=True, exist_ok=True)
-        
-        print("=== Weather Data Acquisition ===")
+        logger.info("=== Weather Data Acquisition ===")
         if target_date:
-            print(f"Target date: {target_date} (for temporal lag analysis)")
+            logger.info(f"Target date: {target_date} (for temporal lag analysis)")
         else:
-            print("Fetching latest weather data...")
+            logger.info("Fetching latest weather data...")
         
-        fetch_air_temperature(target_date)
-        fetch_rainfall(target_date)
+        # Temperature and rainfall come from independent endpoints; fetch them
+        # concurrently so the step takes as long as the slower request.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [
+                pool.submit(fetch_air_temperature, target_date),
+                pool.submit(fetch_rainfall, target_date),
+            ]
+            for future in futures:
+                future.result()
 
-        print("Weather data collection completed successfully")
+        logger.info("Weather data collection completed successfully")
         
     except Exception as e:
-        print(f"Error in weather data acquisition: {e}")
+        logger.error(f"Error in weather data acquisition: {e}")
         raise
 
+def _historical_date(months_back: int) -> str:
+    """Return the YYYY-MM-DD date roughly `months_back` months (30-day) ago."""
+    return (datetime.now() - months_back * 30 * _DAY).strftime("%Y-%m-%d")
+
 def fetch_historical_weather(months_back: int = 2) -> None:
     """
     Fetch weather data from N months ago for temporal lag analysis.
@@ -183,27 +212,37 @@ def fetch_historical_weather(months_back: int = 2) -> None:
     Args:
         months_back: Number of months to go back (default: 2 for temporal lag)
     """
-    target_date = (datetime.now() - timedelta(days=months_back * 30)).strftime("%Y-%m-%d")
-    print(f"Fetching historical weather data from {months_back} months ago: {target_date}")
-    print("Research note: 2-month lag provides better fitting model for dengue prediction")
+    target_date = _historical_date(months_back)
+    logger.info(f"Fetching historical weather data from {months_back} months ago: {target_date}")
+    logger.info("Research note: 2-month lag provides better fitting model for dengue prediction")
     fetch_weather(target_date)
 
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
     # Example usage:
     # fetch_weather()  # Latest data
     # fetch_weather("2024-08-09")  # Specific date
     # fetch_historical_weather(2)  # 2 months ago for temporal lag
     
-    print("=== Weather Data Acquisition ===")
-    print("Fetching latest weather data...")
-    fetch_weather()
+    logger.info("=== Weather Data Acquisition ===")
+    lag_date = _historical_date(2)
+    logger.info(f"Fetching latest and historical ({lag_date}, temporal lag) weather data...")
     
-    print("\nFetching historical weather data for temporal lag analysis...")
-    fetch_historical_weather(2)
+    # The four dataset/date requests are independent; run them together over
+    # the shared client so the run takes as long as the slowest request.
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [
+            pool.submit(fetch_air_temperature),
+            pool.submit(fetch_rainfall),
+            pool.submit(fetch_air_temperature, lag_date),
+            pool.submit(fetch_rainfall, lag_date),
+        ]
+        for future in futures:
+            future.result()
     
-    print("\nWeather data acquisition completed!")
+    logger.info("Weather data acquisition completed!")
 
 
 """
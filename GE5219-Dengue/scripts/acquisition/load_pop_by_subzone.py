@@ -1,26 +1,69 @@
 """Fetch population counts by subzone from Singapore Open Data API."""
 from __future__ import annotations
 
-from datetime import datetime
+import atexit
+import logging
+import os
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
-import json
 
 import httpx
-import pandas as pd
+import orjson
+
+try:
+    from ._config import CONFIG_PATH, get_api_config
+    from ._snapshots import conditional_headers, latest_snapshot, save_etag
+except ImportError:  # run as a script from scripts/acquisition
+    from _config import CONFIG_PATH, get_api_config
+    from _snapshots import conditional_headers, latest_snapshot, save_etag
+
+logger = logging.getLogger(__name__)
+
+# Kept for callers of the former eager loader; the config is now read on first use.
+load_api_config = get_api_config
 
 ROOT_DIR = Path(__file__).resolve().parents[2]
-CONFIG_PATH = ROOT_DIR / "config" / "api_config.json"
 RAW_POPULATION_DIR = ROOT_DIR / "data" / "raw" / "population"
+RAW_POPULATION_DIR.mkdir(parents=True, exist_ok=True)
+_TIMESTAMP_FORMAT = "%Y%m%dT%H%M%SZ"
 
 
-def load_api_config() -> Dict[str, Any]:
-    """Load API configuration from JSON file."""
-    with CONFIG_PATH.open("r", encoding="utf-8") as config_file:
-        return json.load(config_file)
+# Shared, pooled client reused across fetches (keep-alive, no repeat TLS setup).
+_CLIENT = httpx.Client(
+    timeout=30.0,
+    http2=True,
+    headers={"Accept-Encoding": "gzip, br"},
+    limits=httpx.Limits(max_keepalive_connections=10, max_connections=20, keepalive_expiry=30.0),
+)
+atexit.register(_CLIENT.close)
 
 
-API_CONFIG = load_api_config()
+# O_DSYNC / posix_fallocate are POSIX-only; fall back to a plain write + fsync.
+_DSYNC_FLAG = getattr(os, "O_DSYNC", 0)
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0) | _DSYNC_FLAG
+
+
+def _write_durable(path: Path, payload: bytes) -> None:
+    """Write `payload` to `path` in one preallocated, data-synchronous write."""
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        if payload and hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(fd, 0, len(payload))
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+        if not _DSYNC_FLAG:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@lru_cache(maxsize=32)
+def _year_filter(year: str) -> str:
+    """Return the compact `filters` query value for `year`, cached for backfill loops."""
+    return orjson.dumps({"year": year}).decode()
 
 
 def fetch_population_data(target_date: Optional[str] = None, limit: int = 5000) -> Path:
@@ -31,31 +74,35 @@ def fetch_population_data(target_date: Optional[str] = None, limit: int = 5000)
         limit: Maximum number of records to request from the API.
 
     Returns:
-        The path to the saved JSON file containing metadata and payload.
+        The path to the saved JSON file containing metadata and payload. When the
+        server answers 304 Not Modified to the stored ETag, the previous snapshot
+        for the same date is returned instead of downloading it again.
     """
     try:
-        RAW_POPULATION_DIR.mkdir(parents=True, exist_ok=True)
-
-        timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        timestamp = datetime.now(timezone.utc).strftime(_TIMESTAMP_FORMAT)
         date_suffix = f"_{target_date}" if target_date else "_latest"
-        output_file = RAW_POPULATION_DIR / f"population_by_subzone{date_suffix}_{timestamp}.json"
+        name_prefix = f"population_by_subzone{date_suffix}_"
+        output_file = RAW_POPULATION_DIR / f"{name_prefix}{timestamp}.json"
+        previous_file = latest_snapshot(RAW_POPULATION_DIR, name_prefix)
 
-        population_config = API_CONFIG["nea"]["population_by_subzone"]
+        population_config = get_api_config()["nea"]["population_by_subzone"]
         dataset_id = population_config["dataset_id"]
         base_url = population_config["base_url"]
         url = f"{base_url}={dataset_id}"
 
         params: Dict[str, Any] = {"limit": limit}
         if target_date:
-            params["filters"] = json.dumps({"year": target_date})
-            print(f"Fetching population data filtered by year/date: {target_date}")
+            params["filters"] = _year_filter(target_date)
+            logger.info(f"Fetching population data filtered by year/date: {target_date}")
         else:
-            print("Fetching latest population by subzone data...")
+            logger.info("Fetching latest population by subzone data...")
 
-        with httpx.Client(timeout=30.0) as client:
-            response = client.get(url, params=params)
-            response.raise_for_status()
-            population_payload = response.json()
+        response = _CLIENT.get(url, params=params, headers=conditional_headers(previous_file))
+        if response.status_code == 304 and previous_file is not None:
+            logger.info(f"Population data unchanged on server; reusing: {previous_file}")
+            return previous_file
+        response.raise_for_status()
+        population_payload = orjson.loads(response.content)
 
         records = population_payload.get("result", {}).get("records", [])
         metadata = {
@@ -71,32 +118,28 @@ def fetch_population_data(target_date: Optional[str] = None, limit: int = 5000)
             "data": population_payload,
         }
 
-        output_file.write_text(json.dumps(output_data, indent=2), encoding="utf-8")
-        print(f"Population data saved to: {output_file}")
-        print(f"Records fetched: {metadata['record_count']}")
-
-        df = pd.DataFrame(records)
-        print("\nPopulation Data Preview:")
-        if df.empty:
-            print("No records returned from the API.")
-        else:
-            print(df.head())
+        _write_durable(output_file, orjson.dumps(output_data))
+        save_etag(output_file, response)
+        logger.info(f"Population data saved to: {output_file}")
+        logger.info(f"Records fetched: {metadata['record_count']}")
+        logger.info("Run preview_population.py to inspect the saved records.")
 
         return output_file
 
     except httpx.HTTPStatusError as e:
-        print(f"Error code: {e.response.status_code}, HTTP Error: {e.response.text}")
+        logger.error(f"Error code: {e.response.status_code}, HTTP Error: {e.response.text}")
         raise
     except httpx.TimeoutException:
-        print("Error code: TIMEOUT, Connection timeout - API server not responding")
+        logger.error("Error code: TIMEOUT, Connection timeout - API server not responding")
         raise
-    except json.JSONDecodeError as e:
-        print(f"Error code: JSON_DECODE, Invalid JSON response: {str(e)}")
+    except orjson.JSONDecodeError as e:
+        logger.error(f"Error code: JSON_DECODE, Invalid JSON response: {str(e)}")
         raise
     except Exception as e:
-        print(f"Error code: UNKNOWN, Unexpected error: {str(e)}")
+        logger.error(f"Error code: UNKNOWN, Unexpected error: {str(e)}")
         raise
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
     fetch_population_data()
\ No newline at end of file
@@ -1,26 +1,136 @@
 """Fetch subzone boundary GeoJSON data via Singapore Open Data polling endpoint."""
 from __future__ import annotations
 
-from datetime import datetime
+import atexit
+from datetime import datetime, timezone
+import logging
+import re
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional
-import json
+from typing import Callable, Dict, Any, List, Optional, Tuple, TypeVar
 
 import httpx
+import orjson
 import pandas as pd
 
-ROOT_DIR = Path(__file__).resolve().parents[2]
-CONFIG_PATH = ROOT_DIR / "config" / "api_config.json"
-RAW_BOUNDARIES_DIR = ROOT_DIR / "data" / "raw" / "boundaries"
-
+try:
+    from ._config import CONFIG_PATH, get_api_config
+    from ._snapshots import conditional_headers, latest_snapshot, save_etag, stream_envelope
+except ImportError:  # run as a script from scripts/acquisition
+    from _config import CONFIG_PATH, get_api_config
+    from _snapshots import conditional_headers, latest_snapshot, save_etag, stream_envelope
 
-def load_api_config() -> Dict[str, Any]:
-    """Load API configuration from JSON file."""
-    with CONFIG_PATH.open("r", encoding="utf-8") as config_file:
-        return json.load(config_file)
+logger = logging.getLogger(__name__)
 
+# Kept for callers of the former eager loader; the config is now read on first use.
+load_api_config = get_api_config
 
-API_CONFIG = load_api_config()
+ROOT_DIR = Path(__file__).resolve().parents[2]
+RAW_BOUNDARIES_DIR = ROOT_DIR / "data" / "raw" / "boundaries"
+_TIMESTAMP_FORMAT = "%Y%m%dT%H%M%SZ"
+
+
+# Shared keep-alive client: the poll request and the GeoJSON download (and
+# repeated runs in one process) reuse a pooled connection. The transport
+# retries failed connects itself; a short connect timeout keeps a dead host
+# from eating the whole read budget.
+_CLIENT = httpx.Client(
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=3,
+        limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=30.0),
+    ),
+    timeout=httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=5.0),
+    headers={"Accept-Encoding": "gzip, br"},
+)
+atexit.register(_CLIENT.close)
+
+_RETRY_ATTEMPTS = 4
+_RETRY_MAX_DELAY = 10.0
+
+T = TypeVar("T")
+
+_PREVIEW_ROWS = 5
+_FEATURES_KEY = re.compile(rb'"features"\s*:\s*\[')
+_FEATURE_TYPE = re.compile(rb'"type"\s*:\s*"Feature"')
+_PROPERTIES_KEY = re.compile(rb'"properties"\s*:\s*\{')
+_OBJECT_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}]')
+
+
+def _with_retries(request: Callable[..., T], *args: Any) -> T:
+    """Call `request(*args)`, retrying network errors and 5xx responses with exponential backoff."""
+    attempt = 1
+    while True:
+        try:
+            return request(*args)
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            transient = isinstance(e, httpx.TransportError) or e.response.status_code >= 500
+            if not transient or attempt == _RETRY_ATTEMPTS:
+                raise
+            delay = min(2.0 ** (attempt - 1), _RETRY_MAX_DELAY)
+            logger.warning(f"Attempt {attempt} failed ({type(e).__name__}); retrying in {delay:.0f}s")
+            time.sleep(delay)
+            attempt += 1
+
+
+def _poll_download(poll_url: str) -> Dict[str, Any]:
+    """Request the poll-download endpoint and return its parsed JSON body."""
+    response = _CLIENT.get(poll_url)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+def _download_geojson(
+    data_url: str, previous_file: Optional[Path], output_file: Path, metadata: Dict[str, Any]
+) -> Optional[List[Dict[str, Any]]]:
+    """Stream the GeoJSON into `output_file` and return the preview properties, or None on 304 Not Modified."""
+    def record_features(body: memoryview) -> List[Dict[str, Any]]:
+        metadata["record_count"], preview = _scan_features(body)
+        return preview
+
+    with _CLIENT.stream("GET", data_url, headers=conditional_headers(previous_file)) as data_response:
+        if data_response.status_code == 304 and previous_file is not None:
+            return None
+        if data_response.is_error:
+            data_response.read()  # keep the body available to error handlers
+        data_response.raise_for_status()
+        preview = stream_envelope(data_response, output_file, metadata, record_features)
+    save_etag(output_file, data_response)
+    return preview
+
+
+def _object_end(body: memoryview, start: int) -> int:
+    """Return the offset just past the JSON object opening at `body[start]`."""
+    depth = 0
+    for token in _OBJECT_TOKEN.finditer(body, start):
+        if token.group() == b"{":
+            depth += 1
+        elif token.group() == b"}":
+            depth -= 1
+            if depth == 0:
+                return token.end()
+    raise ValueError("Unterminated JSON object in GeoJSON payload")
+
+
+def _scan_features(body: memoryview) -> Tuple[int, List[Dict[str, Any]]]:
+    """Count features and parse the first few `properties` objects without building the JSON tree.
+
+    Escaped quotes inside string values never match the key patterns, so a
+    C-level regex scan over the bytes is enough; only the preview slices are
+    handed to orjson. Both scans start at the features array so top-level
+    members such as `crs`, which has its own `properties`, are skipped.
+    """
+    features = _FEATURES_KEY.search(body)
+    if features is None:
+        return 0, []
+    count = sum(1 for _ in _FEATURE_TYPE.finditer(body, features.end()))
+    preview: List[Dict[str, Any]] = []
+    for match in _PROPERTIES_KEY.finditer(body, features.end()):
+        if len(preview) == _PREVIEW_ROWS:
+            break
+        start = match.end() - 1
+        preview.append(orjson.loads(body[start:_object_end(body, start)]))
+    return count, preview
 
 
 def fetch_subzone_boundaries(target_date: Optional[str] = None) -> Path:
@@ -30,86 +140,79 @@ def fetch_subzone_boundaries(target_date: Optional[str] = None) -> Path:
         target_date: Optional date string (YYYY-MM-DD) captured in metadata for provenance.
 
     Returns:
-        The path to the saved JSON file containing metadata and GeoJSON payload.
+        The path to the saved JSON file containing metadata and GeoJSON payload. When
+        the GeoJSON download answers 304 Not Modified to the stored ETag, the previous
+        snapshot for the same date is returned instead.
     """
     try:
         RAW_BOUNDARIES_DIR.mkdir(parents=True, exist_ok=True)
 
-        timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        timestamp = datetime.now(timezone.utc).strftime(_TIMESTAMP_FORMAT)
         date_suffix = f"_{target_date}" if target_date else "_latest"
-        output_file = RAW_BOUNDARIES_DIR / f"subzone_boundaries{date_suffix}_{timestamp}.json"
+        name_prefix = f"subzone_boundaries{date_suffix}_"
+        output_file = RAW_BOUNDARIES_DIR / f"{name_prefix}{timestamp}.json"
+        previous_file = latest_snapshot(RAW_BOUNDARIES_DIR, name_prefix)
 
-        boundary_config = API_CONFIG["nea"]["subzone_boundaries"]
+        boundary_config = get_api_config()["nea"]["subzone_boundaries"]
         dataset_id = boundary_config["dataset_id"]
         base_url = boundary_config["base_url"]
         poll_url = f"{base_url}/{dataset_id}/poll-download"
 
-        print(f"Fetching subzone boundaries for date: {target_date or 'latest'}")
-
-        with httpx.Client(timeout=30.0) as client:
-            poll_response = client.get(poll_url)
-            poll_response.raise_for_status()
-            poll_payload = poll_response.json()
+        logger.info(f"Fetching subzone boundaries for date: {target_date or 'latest'}")
 
-            if poll_payload.get("code") != 0:
-                error_msg = poll_payload.get("errMsg", "Unknown API error")
-                print(f"Error code: {poll_payload.get('code')}, API Error: {error_msg}")
-                raise RuntimeError(f"API Error: {error_msg}")
+        poll_payload = _with_retries(_poll_download, poll_url)
 
-            data_url = poll_payload["data"]["url"]
-            print(f"Data URL obtained: {data_url}")
+        if poll_payload.get("code") != 0:
+            error_msg = poll_payload.get("errMsg", "Unknown API error")
+            logger.error(f"Error code: {poll_payload.get('code')}, API Error: {error_msg}")
+            raise RuntimeError(f"API Error: {error_msg}")
 
-            data_response = client.get(data_url)
-            data_response.raise_for_status()
-            geojson_payload = data_response.json()
+        data_url = poll_payload["data"]["url"]
+        logger.info(f"Data URL obtained: {data_url}")
 
-        features = []
-        if isinstance(geojson_payload, dict):
-            features = geojson_payload.get("features", [])
-
-        metadata = {
+        # Metadata for provenance (record_count filled in on save)
+        metadata: Dict[str, Any] = {
             "fetch_timestamp": timestamp,
             "target_date": target_date,
             "api_endpoint": poll_url,
             "data_url": data_url,
-            "record_count": len(features),
         }
 
-        output_data = {
-            "metadata": metadata,
-            "data": geojson_payload,
-        }
+        preview_rows = _with_retries(_download_geojson, data_url, previous_file, output_file, metadata)
+        if preview_rows is None:
+            logger.info(f"Subzone boundaries unchanged on server; reusing: {previous_file}")
+            return previous_file
 
-        output_file.write_text(json.dumps(output_data, indent=2), encoding="utf-8")
-        print(f"Subzone boundary data saved to: {output_file}")
-        print(f"Records fetched: {metadata['record_count']}")
+        logger.info(f"Subzone boundary data saved to: {output_file}")
+        logger.info(f"Records fetched: {metadata['record_count']}")
 
-        df = pd.DataFrame([feature.get("properties", {}) for feature in features])
+        # Only the first few features' properties were parsed for the preview.
+        df = pd.DataFrame(preview_rows)
         preview_columns = [col for col in ("SUBZONE_N", "PLN_AREA_N", "REGION_N", "CA_IND") if col in df.columns]
 
-        print("\nSubzone Boundary Data Preview:")
         if df.empty:
-            print("No features returned from the API.")
+            logger.info("Subzone Boundary Data Preview: no features returned from the API.")
         elif preview_columns:
-            print(df[preview_columns].head())
+            logger.info("Subzone Boundary Data Preview:\n%s", df[preview_columns])
         else:
-            print(df.head())
+            logger.info("Subzone Boundary Data Preview:\n%s", df)
 
         return output_file
 
     except httpx.HTTPStatusError as e:
-        print(f"Error code: {e.response.status_code}, HTTP Error: {e.response.text}")
+        logger.error(f"Error code: {e.response.status_code}, HTTP Error: {e.response.text}")
         raise
     except httpx.TimeoutException:
-        print("Error code: TIMEOUT, Connection timeout - API server not responding")
+        logger.error("Error code: TIMEOUT, Connection timeout - API server not responding")
         raise
-    except json.JSONDecodeError as e:
-        print(f"Error code: JSON_DECODE, Invalid JSON response: {str(e)}")
+    except orjson.JSONDecodeError as e:
+        logger.error(f"Error code: JSON_DECODE, Invalid JSON response: {str(e)}")
         raise
     except Exception as e:
-        print(f"Error code: UNKNOWN, Unexpected error: {str(e)}")
+        logger.error(f"Error code: UNKNOWN, Unexpected error: {str(e)}")
         raise
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
     fetch_subzone_boundaries()
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""Preview a saved population-by-subzone snapshot as a DataFrame."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+import sys
+
+import orjson
+import pandas as pd
+
+try:
+    from ._snapshots import latest_snapshot
+except ImportError:  # run as a script from scripts/acquisition
+    from _snapshots import latest_snapshot
+
+RAW_POPULATION_DIR = Path(__file__).resolve().parents[2] / "data" / "raw" / "population"
+
+
+def latest_population_snapshot() -> Optional[Path]:
+    """Return the most recently written population snapshot, if any."""
+    return latest_snapshot(RAW_POPULATION_DIR, "population_by_subzone_")
+
+
+def preview_population(snapshot: Optional[Path] = None, rows: int = 5) -> None:
+    """Print the first `rows` records of a population snapshot.
+
+    Args:
+        snapshot: Path written by `fetch_population_data`. Defaults to the newest one.
+        rows: Number of records to show.
+    """
+    snapshot = snapshot or latest_population_snapshot()
+    if snapshot is None:
+        print(f"No population snapshots found in {RAW_POPULATION_DIR}")
+        return
+
+    payload = orjson.loads(snapshot.read_bytes())
+    records = payload.get("data", {}).get("result", {}).get("records", [])
+
+    df = pd.DataFrame(records[:rows])
+    print(f"\nPopulation Data Preview ({snapshot.name}):")
+    if df.empty:
+        print("No records returned from the API.")
+    else:
+        print(df)
+
+
+if __name__ == "__main__":
+    preview_population(Path(sys.argv[1]) if len(sys.argv) > 1 else None)
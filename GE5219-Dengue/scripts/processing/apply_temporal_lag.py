@@ -3,12 +3,20 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-import json
+import orjson
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import geopandas as gpd
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
+import mmap
+import os
+import re
 import sys
 import traceback
 
@@ -16,6 +24,86 @@ import traceback
 SCRIPTS_DIR = Path(__file__).resolve().parent.parent
 RAW_WEATHER = SCRIPTS_DIR.parent / "data" / "raw" / "weather"
 PROCESSED_WEATHER = SCRIPTS_DIR.parent / "data" / "processed" / "weather"
+_TIMESTAMP_FORMAT = "%Y%m%dT%H%M%SZ"
+_DAY = timedelta(days=1)
+_READING_COLUMNS = ['timestamp', 'stationId', 'value']
+_FILE_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Below this size a plain read is cheaper than setting up a mapping.
+_MMAP_THRESHOLD = 1 << 20
+
+def _read_json(file_path: Path) -> Any:
+    """
+    Parse a JSON file with orjson.
+    
+    Files of 1 MiB or more are parsed straight from a read-only mmap, so the
+    raw bytes are never copied into a Python object alongside the parsed tree.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < _MMAP_THRESHOLD:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+@lru_cache(maxsize=8)
+def _index_weather_dir(weather_dir: Path, dir_mtime_ns: int) -> Dict[str, List[Path]]:
+    """
+    Map each YYYY-MM-DD date in `weather_dir` file names to its JSON files.
+    
+    One os.scandir pass replaces a glob per lookup; `dir_mtime_ns` is part of
+    the cache key so files added since the last scan invalidate the index.
+    """
+    index: Dict[str, List[Path]] = defaultdict(list)
+    with os.scandir(weather_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json"):
+                match = _FILE_DATE.search(entry.name)
+                if match:
+                    index[match.group(0)].append(Path(entry.path))
+    return dict(index)
+
+def _flatten_readings(payload: Dict) -> List[Dict]:
+    """Flatten a v2 real-time payload into one {timestamp, stationId, value} record per reading."""
+    return [
+        {'timestamp': reading.get('timestamp'), 'stationId': item.get('stationId'), 'value': item.get('value')}
+        for reading in payload.get('readings', [])
+        for item in reading.get('data', [])
+    ]
+
+def _readings_frame(records: List[Dict]) -> pd.DataFrame:
+    """
+    Build a readings DataFrame with fixed columns and narrow dtypes.
+    
+    Timestamps are parsed as UTC, values are float32 (well beyond sensor
+    precision) and the few distinct station ids are stored as a category,
+    which Parquet writes as a dictionary-encoded column.
+    """
+    df = pd.DataFrame.from_records(records, columns=_READING_COLUMNS, coerce_float=True)
+    df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
+    df['value'] = df['value'].astype('float32')
+    df['stationId'] = df['stationId'].astype('category')
+    return df
+
+def _lag_date(lag_months: int) -> str:
+    """Return the YYYY-MM-DD date roughly `lag_months` months (30-day) ago."""
+    return (datetime.now() - lag_months * 30 * _DAY).strftime("%Y-%m-%d")
+
+def _records_from_file(file_path: Path) -> List[Dict]:
+    """Parse one raw weather snapshot and return its reading records."""
+    file_data = _read_json(file_path)
+    
+    # Extract actual weather readings
+    payload = file_data.get('data') if isinstance(file_data, dict) else None
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        # Unwrap the API's {"code", "data": {...}} response to reach the readings
+        body = payload.get('data', payload)
+        if isinstance(body, dict) and 'readings' in body:
+            return _flatten_readings(body)
+        return [payload]
+    print(f"⚠️  Unexpected data structure in {file_path.name}")
+    return []
 
 def load_weather_data(data_type: str, lag_months: int = 2) -> List[Dict]:
     """
@@ -34,31 +122,21 @@ def load_weather_data(data_type: str, lag_months: int = 2) -> List[Dict]:
             raise FileNotFoundError(f"Weather data directory not found: {weather_dir}")
         
         # Find files from approximately lag_months ago
-        target_date = datetime.now() - timedelta(days=lag_months * 30)
-        date_pattern = target_date.strftime("%Y-%m-%d")
+        date_pattern = _lag_date(lag_months)
         
         # Look for files matching the target date
-        matching_files = list(weather_dir.glob(f"*{date_pattern}*.json"))
+        file_index = _index_weather_dir(weather_dir, weather_dir.stat().st_mtime_ns)
+        matching_files = file_index.get(date_pattern, [])
         
         if not matching_files:
             print(f"⚠️  No {data_type} files found for lag date {date_pattern}")
-            print(f"   Available files: {[f.name for f in weather_dir.glob('*.json')]}")
+            print(f"   Available dates: {sorted(file_index)}")
             return []
         
         all_data = []
         for file_path in matching_files:
             print(f"Loading {data_type} data from: {file_path.name}")
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                file_data = json.load(f)
-            
-            # Extract actual weather readings
-            if 'data' in file_data and isinstance(file_data['data'], list):
-                all_data.extend(file_data['data'])
-            elif isinstance(file_data, dict) and 'data' in file_data:
-                all_data.append(file_data['data'])
-            else:
-                print(f"⚠️  Unexpected data structure in {file_path.name}")
+            all_data.extend(_records_from_file(file_path))
         
         print(f"✓ Loaded {len(all_data)} {data_type} records with {lag_months}-month lag")
         return all_data
@@ -77,21 +155,18 @@ def process_temperature_lag(lag_months: int = 2) -> pd.DataFrame:
         if not temp_data:
             raise ValueError("No temperature data available for processing")
         
-        # Convert to DataFrame for easier processing
-        temp_df = pd.DataFrame(temp_data)
+        # Convert to a typed DataFrame (fixed columns, no dtype inference)
+        temp_df = _readings_frame(temp_data)
         
         # Ensure we have required columns
-        required_cols = ['timestamp', 'value', 'stationId']
-        missing_cols = [col for col in required_cols if col not in temp_df.columns]
+        missing_cols = [col for col in _READING_COLUMNS if temp_df[col].isna().all()]
         if missing_cols:
             print(f"⚠️  Missing columns in temperature data: {missing_cols}")
-            print(f"   Available columns: {list(temp_df.columns)}")
         
         # Calculate minimum temperature (important for dengue modeling)
-        if 'value' in temp_df.columns:
-            min_temp = temp_df['value'].min()
-            mean_temp = temp_df['value'].mean()
-            print(f"   Temperature stats - Min: {min_temp:.2f}°C, Mean: {mean_temp:.2f}°C")
+        min_temp = temp_df['value'].min()
+        mean_temp = temp_df['value'].mean()
+        print(f"   Temperature stats - Min: {min_temp:.2f}°C, Mean: {mean_temp:.2f}°C")
         
         return temp_df
         
@@ -108,21 +183,18 @@ def process_rainfall_lag(lag_months: int = 2) -> pd.DataFrame:
         if not rainfall_data:
             raise ValueError("No rainfall data available for processing")
         
-        # Convert to DataFrame for easier processing
-        rainfall_df = pd.DataFrame(rainfall_data)
+        # Convert to a typed DataFrame (fixed columns, no dtype inference)
+        rainfall_df = _readings_frame(rainfall_data)
         
         # Ensure we have required columns
-        required_cols = ['timestamp', 'value', 'stationId']
-        missing_cols = [col for col in required_cols if col not in rainfall_df.columns]
+        missing_cols = [col for col in _READING_COLUMNS if rainfall_df[col].isna().all()]
         if missing_cols:
             print(f"⚠️  Missing columns in rainfall data: {missing_cols}")
-            print(f"   Available columns: {list(rainfall_df.columns)}")
         
         # Calculate rainfall statistics
-        if 'value' in rainfall_df.columns:
-            total_rainfall = rainfall_df['value'].sum()
-            mean_rainfall = rainfall_df['value'].mean()
-            print(f"   Rainfall stats - Total: {total_rainfall:.2f}mm, Mean: {mean_rainfall:.2f}mm")
+        total_rainfall = rainfall_df['value'].sum()
+        mean_rainfall = rainfall_df['value'].mean()
+        print(f"   Rainfall stats - Total: {total_rainfall:.2f}mm, Mean: {mean_rainfall:.2f}mm")
         
         return rainfall_df
         
@@ -131,26 +203,36 @@ def process_rainfall_lag(lag_months: int = 2) -> pd.DataFrame:
         raise
 
 def save_lagged_data(data: pd.DataFrame, data_type: str, lag_months: int = 2) -> Path:
-    """Save processed lagged weather data."""
+    """
+    Save processed lagged weather data as a zstd-compressed Parquet file.
+    
+    Column dtypes survive the round trip, and the summary header (lag, lag
+    date, timestamp, record count) is stored as JSON under the `lag_metadata` key
+    of the Parquet schema metadata.
+    """
     try:
         output_dir = PROCESSED_WEATHER / data_type / "lagged"
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-        output_file = output_dir / f"{data_type}_lag_{lag_months}months_{timestamp}.json"
+        timestamp = datetime.now(timezone.utc).strftime(_TIMESTAMP_FORMAT)
+        lag_date = _lag_date(lag_months)
+        output_file = output_dir / f"{data_type}_lag_{lag_months}months_{lag_date}_{timestamp}.parquet"
         
-        # Convert DataFrame to records for JSON serialization
-        records = data.to_dict('records')
-        
-        result = {
+        header = {
             "lag_months": lag_months,
+            "lag_date": lag_date,
             "processed_timestamp": timestamp,
-            "record_count": len(records),
-            "data": records
+            "record_count": len(data),
         }
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, default=str)
+        # Columnar Arrow table straight from the frame; keep pandas' own schema
+        # metadata alongside ours so pd.read_parquet restores the dtypes.
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            b"lag_metadata": orjson.dumps(header),
+        })
+        pq.write_table(table, output_file, compression="zstd")
         
         print(f"✓ Saved lagged {data_type} data to: {output_file}")
         return output_file
@@ -159,6 +241,39 @@ def save_lagged_data(data: pd.DataFrame, data_type: str, lag_months: int = 2) ->
         print(f"✗ Error saving lagged {data_type} data: {str(e)}")
         raise
 
+def _current_lag_artifact(data_type: str, lag_months: int) -> Optional[Path]:
+    """
+    Return the newest lagged artifact for today's lag date if it is up to date.
+    
+    An artifact is current when it is at least as new as every raw weather
+    file for that lag date; otherwise (or if either side is missing) None.
+    """
+    weather_dir = RAW_WEATHER / data_type
+    output_dir = PROCESSED_WEATHER / data_type / "lagged"
+    if not weather_dir.exists() or not output_dir.exists():
+        return None
+    
+    lag_date = _lag_date(lag_months)
+    input_files = _index_weather_dir(weather_dir, weather_dir.stat().st_mtime_ns).get(lag_date)
+    artifacts = list(output_dir.glob(f"{data_type}_lag_{lag_months}months_{lag_date}_*.parquet"))
+    if not input_files or not artifacts:
+        return None
+    
+    latest_mtime, latest = max((path.stat().st_mtime, path) for path in artifacts)
+    newest_input = max(path.stat().st_mtime for path in input_files)
+    return latest if latest_mtime >= newest_input else None
+
+def _run_lag_pipeline(data_type: str, lag_months: int = 2) -> Path:
+    """Process one weather type with temporal lag and save the result (skipped if already current)."""
+    current = _current_lag_artifact(data_type, lag_months)
+    if current is not None:
+        print(f"✓ Lagged {data_type} data is up to date, skipping: {current}")
+        return current
+    
+    process_lag = process_temperature_lag if data_type == "temperature" else process_rainfall_lag
+    lagged_df = process_lag(lag_months=lag_months)
+    return save_lagged_data(lagged_df, data_type, lag_months=lag_months)
+
 def main():
     """Apply temporal lag processing to weather data for dengue forecasting."""
     try:
@@ -171,25 +286,20 @@ def main():
             "errors": []
         }
         
-        # Process temperature with lag
-        try:
-            temp_df = process_temperature_lag(lag_months=2)
-            temp_file = save_lagged_data(temp_df, "temperature", lag_months=2)
-            results["temperature"] = str(temp_file)
-        except Exception as e:
-            error_msg = f"Temperature lag processing failed: {str(e)}"
-            results["errors"].append(error_msg)
-            print(f"✗ {error_msg}")
-        
-        # Process rainfall with lag
-        try:
-            rainfall_df = process_rainfall_lag(lag_months=2)
-            rainfall_file = save_lagged_data(rainfall_df, "rainfall", lag_months=2)
-            results["rainfall"] = str(rainfall_file)
-        except Exception as e:
-            error_msg = f"Rainfall lag processing failed: {str(e)}"
-            results["errors"].append(error_msg)
-            print(f"✗ {error_msg}")
+        # Temperature and rainfall are independent (separate inputs and
+        # outputs), so process both lag pipelines concurrently.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [
+                (data_type, pool.submit(_run_lag_pipeline, data_type, 2))
+                for data_type in ("temperature", "rainfall")
+            ]
+            for data_type, future in futures:
+                try:
+                    results[data_type] = str(future.result())
+                except Exception as e:
+                    error_msg = f"{data_type.capitalize()} lag processing failed: {str(e)}"
+                    results["errors"].append(error_msg)
+                    print(f"✗ {error_msg}")
         
         # Summary
         print("\n" + "="*50)
@@ -0,0 +1,51 @@
+"""Check the subzone boundary loader against the bundled Master Plan 2019 GeoJSON sample."""
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import httpx
+import orjson
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from scripts.acquisition import load_subzone_bounds  # noqa: E402
+
+SAMPLE_GEOJSON = ROOT_DIR / "scripts" / "acquisition" / "MasterPlan2019SubzoneBoundaryNoSeaGEOJSON.geojson"
+
+
+class SubzoneBoundsSampleTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.raw = SAMPLE_GEOJSON.read_bytes()
+        self.features = orjson.loads(self.raw)["features"]
+
+    def test_scan_features_skips_crs_properties(self) -> None:
+        count, preview = load_subzone_bounds._scan_features(memoryview(self.raw))
+        self.assertEqual(count, len(self.features))
+        self.assertEqual(preview, [feature["properties"] for feature in self.features[:5]])
+
+    def test_fetch_writes_envelope_and_counts_features(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/poll-download"):
+                return httpx.Response(200, content=orjson.dumps({"code": 0, "data": {"url": "https://cdn.test/geo"}}))
+            return httpx.Response(200, headers={"ETag": '"v1"'}, content=self.raw)
+
+        config = {"nea": {"subzone_boundaries": {"dataset_id": "d_test", "base_url": "https://api.test/v1"}}}
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.multiple(
+            load_subzone_bounds,
+            _CLIENT=httpx.Client(transport=httpx.MockTransport(handler)),
+            RAW_BOUNDARIES_DIR=Path(tmp),
+            get_api_config=lambda: config,
+        ):
+            saved = orjson.loads(load_subzone_bounds.fetch_subzone_boundaries().read_bytes())
+
+        self.assertEqual(saved["metadata"]["record_count"], len(self.features))
+        self.assertEqual(saved["data"], orjson.loads(self.raw))
+
+
+if __name__ == "__main__":
+    unittest.main()